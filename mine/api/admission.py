@@ -0,0 +1,126 @@
+"""
+Admission control for attendee registration bursts.
+
+* ``RegistrationThrottle`` is a per-client, per-event token bucket. Rejected
+  requests get a 429 with a ``Retry-After`` header before the view runs.
+* The sold-out flag is set once an event reaches ``max_capacity`` so later
+  registrations are answered with a 400 straight from the cache.
+* ``reserve_seat`` counts seats handed out per event, including requests
+  still in flight, so a burst larger than the remaining capacity is turned
+  away before the count and insert. ``release_seat`` gives a seat back when
+  the registration does not go through.
+
+State lives in the cache named by ``ADMISSION_CACHE_ALIAS`` (see ``CACHES``
+in settings). The default is an in-process LocMemCache; point it at a
+FileBasedCache or DatabaseCache to share it between worker processes.
+Sold-out flags and seat counters expire after ``ADMISSION_STATE_TIMEOUT``
+seconds and are rebuilt from the database, so changes made elsewhere
+(another worker, ``QuerySet.update()``) are picked up within that window.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+def get_admission_cache():
+    return caches[getattr(settings, 'ADMISSION_CACHE_ALIAS', 'default')]
+
+
+def _state_timeout():
+    return getattr(settings, 'ADMISSION_STATE_TIMEOUT', 5)
+
+
+def _sold_out_key(event_id):
+    return f'event_sold_out_{event_id}'
+
+
+def _seats_key(event_id):
+    return f'event_seats_reserved_{event_id}'
+
+
+def is_sold_out(event_id):
+    return get_admission_cache().get(_sold_out_key(event_id), False)
+
+
+def mark_sold_out(event_id):
+    get_admission_cache().set(_sold_out_key(event_id), True, _state_timeout())
+
+
+def reserve_seat(event):
+    """
+    Take one of ``event``'s seats. Return False (and take nothing) if every
+    seat is already registered or reserved. ``incr`` is atomic on LocMem,
+    Redis and Memcached; the row lock in the view backs up other backends.
+    """
+    cache = get_admission_cache()
+    key = _seats_key(event.pk)
+    try:
+        reserved = cache.incr(key)
+    except ValueError:
+        # Not seeded yet or expired: start from the committed registrations
+        cache.add(key, event.attendees.count(), _state_timeout())
+        reserved = cache.incr(key)
+
+    if reserved > event.max_capacity:
+        release_seat(event.pk)
+        return False
+    return True
+
+
+def release_seat(event_id):
+    try:
+        get_admission_cache().decr(_seats_key(event_id))
+    except ValueError:
+        pass  # expired; the next reservation re-seeds from the database
+
+
+def reset_admission(event_id):
+    """Drop the sold-out flag and seat counter; both are rebuilt on demand."""
+    get_admission_cache().delete_many([_sold_out_key(event_id), _seats_key(event_id)])
+
+
+class RegistrationThrottle(SimpleRateThrottle):
+    """
+    Token bucket keyed on client and event.
+
+    The rate ``'N/period'`` from ``DEFAULT_THROTTLE_RATES['registration']``
+    gives a bucket of N tokens refilled at N per period, so a client can burst
+    up to N registrations and then sustain the configured rate.
+    """
+    scope = 'registration'
+    cache_format = 'throttle_%(scope)s_%(event)s_%(ident)s'
+
+    def __init__(self):
+        super().__init__()
+        self.cache = get_admission_cache()
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'event': view.kwargs.get('event_id'),
+            'ident': self.get_ident(request),
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        self.now = self.timer()
+        tokens, updated = self.cache.get(self.key, (self.num_requests, self.now))
+
+        refill_rate = self.num_requests / self.duration
+        self.tokens = min(self.num_requests, tokens + (self.now - updated) * refill_rate)
+
+        if self.tokens < 1:
+            return self.throttle_failure()
+
+        self.tokens -= 1
+        # Read-modify-write: exact within a process, approximate across processes
+        self.cache.set(self.key, (self.tokens, self.now), self.duration)
+        return True
+
+    def wait(self):
+        refill_rate = self.num_requests / self.duration
+        return (1 - self.tokens) / refill_rate
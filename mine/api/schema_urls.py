@@ -0,0 +1,20 @@
+# api/schema_urls.py
+from django.urls import path
+
+from drf_spectacular.views import (
+  SpectacularAPIView,
+  SpectacularSwaggerView,
+  SpectacularRedocView,
+)
+
+urlpatterns = [
+    path('schema/', SpectacularAPIView.as_view(), name='schema'),
+    # Swagger UI
+    path('schema/swagger-ui/',
+         SpectacularSwaggerView.as_view(url_name='schema'),
+         name='swagger-ui'),
+    # ReDoc UI
+    path('schema/redoc/',
+         SpectacularRedocView.as_view(url_name='schema'),
+         name='redoc'),
+]
@@ -41,3 +41,27 @@ class AttendeeListSerializer(serializers.ModelSerializer):
         model = Attendee
         fields = ['id', 'name', 'email', 'registered_at', 'event_name']
 
+class EventStatsSerializer(serializers.ModelSerializer):
+    attendees_count = serializers.IntegerField(read_only=True)
+    fill_ratio = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Event
+        fields = ['id', 'name', 'start_time', 'max_capacity', 'attendees_count', 'fill_ratio']
+
+
+class RegistrationPeriodSerializer(serializers.Serializer):
+    period = serializers.DateTimeField()
+    count = serializers.IntegerField()
+
+
+class EventStatsDetailSerializer(serializers.Serializer):
+    event_id = serializers.IntegerField()
+    name = serializers.CharField()
+    max_capacity = serializers.IntegerField()
+    attendees_count = serializers.IntegerField()
+    fill_ratio = serializers.FloatField(allow_null=True)
+    sold_out_at = serializers.DateTimeField(allow_null=True)
+    time_to_sellout_seconds = serializers.FloatField(allow_null=True)
+    granularity = serializers.CharField()
+    registrations = RegistrationPeriodSerializer(many=True)
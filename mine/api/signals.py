@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.admission import reset_admission
+from api.stats import clear_stats_cache
+from core.models import Event
+
+
+# Event edits (e.g. a capacity change) drop this process's cached admission
+# state and stats; other processes catch up when their entries expire.
+#
+# There is deliberately no receiver on Attendee: any post_delete listener
+# disables Django's fast-delete path, so deleting an event's attendees would
+# load and signal every row. Removed attendees are picked up through the
+# ADMISSION_STATE_TIMEOUT / EVENT_STATS_CACHE_TIMEOUT expiry instead.
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def reset_event_caches(sender, instance, **kwargs):
+    reset_admission(instance.pk)
+    clear_stats_cache(instance.pk)
+
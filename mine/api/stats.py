@@ -0,0 +1,136 @@
+"""
+Registration statistics for events.
+
+Per-period registration counts are aggregated in the database with
+``Trunc('registered_at', <granularity>)`` and cached. Attendees registered
+more than ``STATS_SETTLE_MARGIN`` ago are treated as settled: their counts
+are kept in the cache, and each refresh only aggregates the settled rows
+added since the last one. Newer rows are aggregated on every request, so a
+registration whose transaction commits late is still counted. The two sets
+are split on ``registered_at``, so no row is counted twice.
+
+Entries are rebuilt in full once they are ``EVENT_STATS_CACHE_TIMEOUT``
+seconds old, even under steady traffic; that is how removed attendees are
+picked up. Event edits also drop this process's entries (see
+api/signals.py); other workers pick them up at their next rebuild.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from core.models import Attendee
+
+GRANULARITIES = ('hour', 'day')
+
+# Longer than any registration transaction: rows registered before
+# now - margin are assumed to be committed.
+STATS_SETTLE_MARGIN = datetime.timedelta(minutes=1)
+
+
+def _timeout():
+    return getattr(settings, 'EVENT_STATS_CACHE_TIMEOUT', 30)
+
+
+def _cache_key(event_id, granularity):
+    return f'event_stats_{event_id or "all"}_{granularity}'
+
+
+def _sellout_cache_key(event_id):
+    return f'event_sold_out_at_{event_id}'
+
+
+def clear_stats_cache(event_id, include_overall=False):
+    scopes = (event_id, None) if include_overall else (event_id,)
+    keys = [_cache_key(scope, granularity) for scope in scopes for granularity in GRANULARITIES]
+    cache.delete_many(keys + [_sellout_cache_key(event_id)])
+
+
+def _aggregate(queryset, granularity):
+    rows = (queryset.annotate(period=Trunc('registered_at', granularity))
+            .values('period')
+            .annotate(count=Count('id'))
+            .order_by('period'))
+    return {row['period']: row['count'] for row in rows}
+
+
+def _merge(buckets, other):
+    merged = dict(buckets)
+    for period, count in other.items():
+        merged[period] = merged.get(period, 0) + count
+    return merged
+
+
+def _refresh_buckets(queryset, cache_key, granularity):
+    """
+    Return ``(buckets, total)`` for ``queryset``, re-aggregating only the rows
+    that settled since the cached state was built, plus the unsettled ones.
+    The cached state is rebuilt from scratch once it is older than
+    ``EVENT_STATS_CACHE_TIMEOUT``, however often it is read.
+    """
+    now = timezone.now()
+    settled_before = now - STATS_SETTLE_MARGIN
+    settled = queryset.filter(registered_at__lt=settled_before)
+
+    state = cache.get(cache_key)
+    if state is None or (now - state['built_at']).total_seconds() >= _timeout():
+        state = {'built_at': now, 'buckets': _aggregate(settled, granularity)}
+    else:
+        newly_settled = settled.filter(registered_at__gte=state['settled_before'])
+        state['buckets'] = _merge(state['buckets'], _aggregate(newly_settled, granularity))
+    state['settled_before'] = settled_before
+    cache.set(cache_key, state, _timeout())
+
+    recent = _aggregate(queryset.filter(registered_at__gte=settled_before), granularity)
+    buckets = _merge(state['buckets'], recent)
+    return buckets, sum(buckets.values())
+
+
+def _registrations(buckets):
+    return [{'period': period, 'count': count} for period, count in sorted(buckets.items())]
+
+
+def _fill_ratio(attendees_count, max_capacity):
+    return attendees_count / max_capacity if max_capacity else None
+
+
+def get_event_stats(event, granularity='hour'):
+    buckets, total = _refresh_buckets(event.attendees.all(), _cache_key(event.pk, granularity), granularity)
+
+    sold_out_at = None
+    if event.max_capacity and total >= event.max_capacity:
+        sold_out_at = cache.get(_sellout_cache_key(event.pk))
+        if sold_out_at is None:
+            # Registration time of the attendee that took the last seat
+            sold_out_at = (event.attendees.order_by('registered_at', 'pk')
+                           .values_list('registered_at', flat=True)[event.max_capacity - 1:event.max_capacity]
+                           .first())
+            cache.set(_sellout_cache_key(event.pk), sold_out_at, _timeout())
+
+    return {
+        'event_id': event.pk,
+        'name': event.name,
+        'max_capacity': event.max_capacity,
+        'attendees_count': total,
+        'fill_ratio': _fill_ratio(total, event.max_capacity),
+        'sold_out_at': sold_out_at,
+        # measured from when the event (and its registration) was created
+        'time_to_sellout_seconds': (sold_out_at - event.created_at).total_seconds() if sold_out_at else None,
+        'granularity': granularity,
+        'registrations': _registrations(buckets),
+    }
+
+
+def get_overall_stats(total_capacity, granularity='hour'):
+    buckets, total = _refresh_buckets(Attendee.objects.all(), _cache_key(None, granularity), granularity)
+    return {
+        'total_capacity': total_capacity,
+        'attendees_count': total,
+        'fill_ratio': _fill_ratio(total, total_capacity),
+        'granularity': granularity,
+        'registrations': _registrations(buckets),
+    }
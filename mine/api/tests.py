@@ -1,12 +1,26 @@
+from unittest import mock
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.test import APITestCase
 from core.models import Event, Attendee
+from api.admission import RegistrationThrottle, is_sold_out, release_seat, reserve_seat
+from api.stats import STATS_SETTLE_MARGIN
+import time
 import datetime
 
 class EventAndAttendeeAPITest(APITestCase):
     def setUp(self):
+        # throttle buckets and sold-out flags are keyed by event id
+        caches['admission'].clear()
+
         # reference “now”
         self.now = timezone.now()
 
@@ -165,3 +179,307 @@ class EventAndAttendeeAPITest(APITestCase):
         url = self.attendees_url(9999)
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class RegistrationAdmissionTest(APITestCase):
+    def setUp(self):
+        caches['admission'].clear()
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name="Launch",
+            location="Hall A",
+            start_time=now + datetime.timedelta(days=1),
+            end_time=now + datetime.timedelta(days=1, hours=2),
+            max_capacity=1
+        )
+        self.url = reverse('event-register-attendee', kwargs={'event_id': self.event.pk})
+
+    def test_last_seat_marks_event_sold_out(self):
+        resp = self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_sold_out(self.event.pk))
+
+    def test_sold_out_rejection_skips_database(self):
+        self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        with self.assertNumQueries(0):
+            resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Event is full", str(resp.data))
+
+    def test_freed_seat_reopens_after_state_timeout(self):
+        self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        Attendee.objects.filter(event=self.event).delete()
+
+        later = time.time() + settings.ADMISSION_STATE_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertFalse(is_sold_out(self.event.pk))
+            resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_attendee_delete_stays_fast(self):
+        for i in range(3):
+            Attendee.objects.create(event=self.event, name="A", email=f"a{i}@example.com")
+        # No per-row signal receivers: a single DELETE, no SELECT of the rows first
+        with self.assertNumQueries(1):
+            Attendee.objects.filter(event=self.event).delete()
+
+    def test_capacity_increase_clears_sold_out_flag(self):
+        self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        self.event.max_capacity = 2
+        self.event.save()
+        self.assertFalse(is_sold_out(self.event.pk))
+
+    def test_sold_out_flag_expires_after_bulk_capacity_change(self):
+        self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        # QuerySet.update() sends no signals, so the flag is not cleared explicitly
+        Event.objects.filter(pk=self.event.pk).update(max_capacity=2)
+        self.assertTrue(is_sold_out(self.event.pk))
+
+        later = time.time() + settings.ADMISSION_STATE_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertFalse(is_sold_out(self.event.pk))
+            resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_in_flight_reservations_turn_away_burst_before_insert(self):
+        # Another request already holds the only seat but has not inserted yet
+        self.assertTrue(reserve_seat(self.event))
+        with self.assertNumQueries(2):  # event load + committed count; no insert
+            resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(resp['Retry-After'], '1')
+        self.assertFalse(Attendee.objects.filter(event=self.event).exists())
+        # Nothing is committed yet, so the event is not flagged as sold out
+        self.assertFalse(is_sold_out(self.event.pk))
+
+    def test_failed_in_flight_request_leaves_event_open(self):
+        # A holds the only seat, B is turned away, then A fails and gives the seat back
+        self.assertTrue(reserve_seat(self.event))
+        resp = self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        release_seat(self.event.pk)
+
+        resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    def test_invalid_payload_never_reserves_a_seat(self):
+        with mock.patch('api.views.reserve_seat') as reserve:
+            resp = self.client.post(self.url, {"name": "", "email": "not-an-email"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        reserve.assert_not_called()
+
+    def test_failed_registration_releases_seat(self):
+        self.event.max_capacity = 2
+        self.event.save()
+        self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+        for _ in range(3):
+            resp = self.client.post(self.url, {"name": "Bob", "email": "bob@example.com"}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT)
+            resp = self.client.post(self.url, {"name": "", "email": "not-an-email"}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(self.url, {"name": "Carol", "email": "carol@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+    @mock.patch.object(RegistrationThrottle, 'THROTTLE_RATES', {'registration': '1/min'})
+    def test_forwarded_for_header_does_not_bypass_throttle(self):
+        self.event.max_capacity = 10
+        self.event.save()
+        self.client.post(self.url, {"name": "A", "email": "a1@example.com"}, format='json',
+                         HTTP_X_FORWARDED_FOR='1.1.1.1')
+        resp = self.client.post(self.url, {"name": "A", "email": "a2@example.com"}, format='json',
+                                HTTP_X_FORWARDED_FOR='2.2.2.2')
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @mock.patch.object(RegistrationThrottle, 'THROTTLE_RATES', {'registration': '2/min'})
+    def test_token_bucket_throttles_burst(self):
+        self.event.max_capacity = 10
+        self.event.save()
+        for i in range(2):
+            resp = self.client.post(self.url, {"name": "A", "email": f"a{i}@example.com"}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        with self.assertNumQueries(0):
+            resp = self.client.post(self.url, {"name": "A", "email": "a9@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', resp)
+
+    @mock.patch.object(RegistrationThrottle, 'THROTTLE_RATES', {'registration': '1/min'})
+    def test_token_bucket_refills_over_time(self):
+        self.event.max_capacity = 10
+        self.event.save()
+        with mock.patch.object(RegistrationThrottle, 'timer', return_value=1000.0):
+            self.client.post(self.url, {"name": "A", "email": "a1@example.com"}, format='json')
+            resp = self.client.post(self.url, {"name": "A", "email": "a2@example.com"}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        with mock.patch.object(RegistrationThrottle, 'timer', return_value=1060.0):
+            resp = self.client.post(self.url, {"name": "A", "email": "a2@example.com"}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+
+
+class EventStatsAPITest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.hour = timezone.now().replace(minute=0, second=0, microsecond=0) - datetime.timedelta(days=1)
+        self.event = Event.objects.create(
+            name="Stats Event",
+            location="Hall S",
+            start_time=timezone.now() + datetime.timedelta(days=1),
+            end_time=timezone.now() + datetime.timedelta(days=1, hours=2),
+            max_capacity=4
+        )
+        self.other = Event.objects.create(
+            name="Other Event",
+            location="Hall O",
+            start_time=timezone.now() + datetime.timedelta(days=2),
+            end_time=timezone.now() + datetime.timedelta(days=2, hours=2),
+            max_capacity=10
+        )
+        # created "a day ago", at the top of the first registration hour
+        Event.objects.filter(pk=self.event.pk).update(created_at=self.hour)
+        self.event.refresh_from_db()
+        self.stats_url = reverse('event-stats', kwargs={'event_id': self.event.pk})
+        self.stats_list_url = reverse('event-stats-list')
+
+    def _format(self, value):
+        return serializers.DateTimeField().to_representation(value)
+
+    def _register(self, event, email, registered_at, **fields):
+        attendee = Attendee.objects.create(event=event, name="X", email=email, **fields)
+        Attendee.objects.filter(pk=attendee.pk).update(registered_at=registered_at)
+        return attendee
+
+    def test_event_stats_hourly_buckets_and_fill_ratio(self):
+        self._register(self.event, "a@example.com", self.hour + datetime.timedelta(minutes=5))
+        self._register(self.event, "b@example.com", self.hour + datetime.timedelta(minutes=50))
+        self._register(self.event, "c@example.com", self.hour + datetime.timedelta(hours=2))
+
+        resp = self.client.get(self.stats_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['attendees_count'], 3)
+        self.assertEqual(resp.data['fill_ratio'], 0.75)
+        self.assertIsNone(resp.data['sold_out_at'])
+        self.assertEqual([r['count'] for r in resp.data['registrations']], [2, 1])
+
+    def test_event_stats_daily_buckets(self):
+        self._register(self.event, "a@example.com", self.hour)
+        self._register(self.event, "b@example.com", self.hour + datetime.timedelta(hours=1))
+        resp = self.client.get(self.stats_url, {'granularity': 'day'})
+        self.assertEqual(resp.data['granularity'], 'day')
+        self.assertEqual(sum(r['count'] for r in resp.data['registrations']), 2)
+
+    def test_invalid_granularity(self):
+        resp = self.client.get(self.stats_url, {'granularity': 'minute'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_event_stats_invalid_event(self):
+        resp = self.client.get(reverse('event-stats', kwargs={'event_id': 9999}))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_time_to_sellout(self):
+        for i in range(4):
+            self._register(self.event, f"s{i}@example.com", self.hour + datetime.timedelta(minutes=10 * (i + 1)))
+        resp = self.client.get(self.stats_url)
+        self.assertEqual(resp.data['fill_ratio'], 1.0)
+        self.assertEqual(resp.data['sold_out_at'], self._format(self.hour + datetime.timedelta(minutes=40)))
+        self.assertEqual(resp.data['time_to_sellout_seconds'], 40 * 60)
+
+    def test_late_commit_is_counted_exactly_once(self):
+        first = self._register(self.event, "a@example.com", self.hour)
+        self._register(self.event, "c@example.com", timezone.now(), pk=first.pk + 10)
+        self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 2)
+
+        # A lower pk, registered before the last refresh, whose transaction committed after it
+        self._register(self.event, "b@example.com", timezone.now() - datetime.timedelta(seconds=5),
+                       pk=first.pk + 5)
+        self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 3)
+
+        # Once the row is past the settle margin it moves into the cached buckets, counted once
+        later = timezone.now() + STATS_SETTLE_MARGIN * 2
+        with mock.patch('api.stats.timezone.now', return_value=later):
+            resp = self.client.get(self.stats_url)
+            self.assertEqual(resp.data['attendees_count'], 3)
+            self.assertEqual(sum(r['count'] for r in resp.data['registrations']), 3)
+            self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 3)
+
+    def test_cached_buckets_expire(self):
+        self._register(self.event, "a@example.com", self.hour)
+        self.client.get(self.stats_url)
+        # Bulk updates send no signals; the cached entry still expires
+        Attendee.objects.filter(event=self.event).update(registered_at=self.hour + datetime.timedelta(hours=5))
+
+        later = time.time() + settings.EVENT_STATS_CACHE_TIMEOUT + 1
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            resp = self.client.get(self.stats_url)
+        self.assertEqual(resp.data['registrations'][0]['period'],
+                         self._format(self.hour + datetime.timedelta(hours=5)))
+
+    def test_cached_buckets_rebuilt_under_steady_traffic(self):
+        self._register(self.event, "a@example.com", self.hour)
+        self._register(self.event, "b@example.com", self.hour)
+        start = timezone.now()
+        self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 2)
+
+        # A change no local signal sees (another worker, a bulk update)
+        Attendee.objects.filter(event=self.event, email="b@example.com").update(event=self.other)
+
+        # A request every 20s keeps the cache entry alive past the 30s timeout
+        counts = []
+        for seconds in (20, 40, 60):
+            with mock.patch('api.stats.timezone.now', return_value=start + datetime.timedelta(seconds=seconds)):
+                counts.append(self.client.get(self.stats_url).data['attendees_count'])
+        self.assertEqual(counts, [2, 1, 1])
+
+    def test_deleted_attendee_counted_after_rebuild(self):
+        attendee = self._register(self.event, "a@example.com", self.hour)
+        self._register(self.event, "b@example.com", self.hour)
+        self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 2)
+        self.assertEqual(self.client.get(self.stats_list_url).data['summary']['attendees_count'], 2)
+        attendee.delete()
+
+        later = timezone.now() + datetime.timedelta(seconds=settings.EVENT_STATS_CACHE_TIMEOUT)
+        with mock.patch('api.stats.timezone.now', return_value=later):
+            self.assertEqual(self.client.get(self.stats_url).data['attendees_count'], 1)
+            self.assertEqual(self.client.get(self.stats_list_url).data['summary']['attendees_count'], 1)
+
+    def test_cross_event_stats(self):
+        self._register(self.event, "a@example.com", self.hour)
+        self._register(self.event, "b@example.com", self.hour)
+        self._register(self.other, "c@example.com", self.hour + datetime.timedelta(hours=1))
+
+        resp = self.client.get(self.stats_list_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        rows = {r['id']: r for r in resp.data['results']}
+        self.assertEqual(rows[self.event.pk]['fill_ratio'], 0.5)
+        self.assertEqual(rows[self.other.pk]['attendees_count'], 1)
+
+        summary = resp.data['summary']
+        self.assertEqual(summary['total_capacity'], 14)
+        self.assertEqual(summary['attendees_count'], 3)
+        self.assertEqual([r['count'] for r in summary['registrations']], [2, 1])
+
+
+class SchemaToggleTest(SimpleTestCase):
+    """Boots the API-only profile in a fresh process so api/urls.py is imported under it."""
+    script = (
+        "import json, sys, django; django.setup();"
+        "from django.test import Client;"
+        "status = Client(HTTP_HOST='localhost').get('/api/schema/').status_code;"
+        "print(json.dumps({'status': status, 'spectacular': 'drf_spectacular' in sys.modules}))"
+    )
+
+    def _boot(self, schema_enabled):
+        env = dict(os.environ,
+                   DJANGO_SETTINGS_MODULE='event_management_system.settings_api',
+                   API_SCHEMA_ENABLED='1' if schema_enabled else '0')
+        proc = subprocess.run([sys.executable, '-c', self.script], cwd=settings.BASE_DIR,
+                              env=env, capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+
+    def test_schema_served_when_enabled(self):
+        result = self._boot(schema_enabled=True)
+        self.assertEqual(result['status'], status.HTTP_200_OK)
+
+    def test_schema_hidden_when_disabled(self):
+        result = self._boot(schema_enabled=False)
+        self.assertEqual(result['status'], status.HTTP_404_NOT_FOUND)
+        self.assertFalse(result['spectacular'])
@@ -1,16 +1,13 @@
 # api/urls.py
-from django.urls import path
+from django.conf import settings
+from django.urls import include, path
 from .views import (
     EventListCreateAPIView,
     EventRetrieveUpdateDestroyAPIView,
     RegisterAttendeeAPIView,
-    AttendeeListAPIView
-)
-
-from drf_spectacular.views import (
-  SpectacularAPIView,
-  SpectacularSwaggerView,
-  SpectacularRedocView,
+    AttendeeListAPIView,
+    EventStatsAPIView,
+    EventStatsListAPIView,
 )
 
 urlpatterns = [
@@ -18,14 +15,10 @@ urlpatterns = [
     path('events/<int:pk>/', EventRetrieveUpdateDestroyAPIView.as_view(), name='event-detail'),
     path('events/<int:event_id>/register/', RegisterAttendeeAPIView.as_view(), name='event-register-attendee'),
     path('events/<int:event_id>/attendees/', AttendeeListAPIView.as_view(), name='event-attendee-list'),
-
-    path('schema/', SpectacularAPIView.as_view(), name='schema'),
-    # Swagger UI
-    path('schema/swagger-ui/',
-         SpectacularSwaggerView.as_view(url_name='schema'),
-         name='swagger-ui'),
-    # ReDoc UI
-    path('schema/redoc/',
-         SpectacularRedocView.as_view(url_name='schema'),
-         name='redoc'),
+    path('events/<int:event_id>/stats/', EventStatsAPIView.as_view(), name='event-stats'),
+    path('stats/', EventStatsListAPIView.as_view(), name='event-stats-list'),
 ]
+
+# Schema / docs views are optional so API-only workers never import drf_spectacular.
+if getattr(settings, 'API_SCHEMA_ENABLED', True):
+    urlpatterns += [path('', include('api.schema_urls'))]
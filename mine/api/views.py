@@ -3,12 +3,18 @@ from django.shortcuts import render
 # Create your views here.
 
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db import IntegrityError, transaction
 from core.models import Event, Attendee
-from api.serializers import EventSerializer, AttendeeRegistrationSerializer, AttendeeListSerializer
+from api.serializers import (EventSerializer, AttendeeRegistrationSerializer, AttendeeListSerializer,
+                             EventStatsSerializer, EventStatsDetailSerializer)
+from api.admission import RegistrationThrottle, is_sold_out, mark_sold_out, release_seat, reserve_seat
+from api.stats import GRANULARITIES, get_event_stats, get_overall_stats
+from django.db.models import Count, ExpressionWrapper, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
 from django.utils import timezone
 from rest_framework.pagination import PageNumberPagination
 
@@ -54,13 +60,14 @@ class EventRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
 class RegisterAttendeeAPIView(generics.CreateAPIView):
     serializer_class = AttendeeRegistrationSerializer
+    throttle_classes = [RegistrationThrottle]
+
     def post(self, request, event_id):
-        event = get_object_or_404(Event, pk=event_id)
+        # Short-circuit once the event has sold out: no DB query for the rejection
+        if is_sold_out(event_id):
+            return self.event_full_response()
 
-        # Check if the event is full
-        if event.is_full():
-            return Response({"detail": "Event is full. Cannot register more attendees."},
-                            status=status.HTTP_400_BAD_REQUEST)
+        event = get_object_or_404(Event, pk=event_id)
 
         # Check if the event has already started/ended
         if not event.is_upcoming():
@@ -68,20 +75,90 @@ class RegisterAttendeeAPIView(generics.CreateAPIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
         serializer = AttendeeRegistrationSerializer(data=request.data)
-        if serializer.is_valid():
-            try:
-                with transaction.atomic():
-                    # Attempt to create the attendee
-                    # This leverages unique_together constraint in the Attendee model for duplicate email check
-                    attendee = Attendee.objects.create(
-                        event=event,
-                        name=serializer.validated_data['name'],
-                        email=serializer.validated_data['email']
-                    )
-                    return Response({"detail": "Attendee registered successfully.",
-                                     "attendee_id": attendee.id}, status=status.HTTP_201_CREATED)
-            except IntegrityError:
-                return Response({"detail": "Attendee with this email is already registered for this event."},
-                                status=status.HTTP_409_CONFLICT) # Conflict status for duplicate
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Claim a seat before inserting, so a burst only reaches the insert
+        # for as many requests as there are seats left
+        if not reserve_seat(event):
+            # Seats may be held by requests still in flight that can yet fail,
+            # so only the committed count decides whether the event is sold out
+            if event.current_attendees_count >= event.max_capacity:
+                mark_sold_out(event.pk)
+                return self.event_full_response()
+            return Response({"detail": "Remaining seats are being claimed. Please retry shortly."},
+                            status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'})
+
+        response = self.register(event, serializer.validated_data)
+        if response.status_code != status.HTTP_201_CREATED:
+            release_seat(event.pk)
+        return response
+
+    def register(self, event, validated_data):
+        try:
+            with transaction.atomic():
+                # Lock the event row so concurrent registrations count and insert one at a time
+                event = Event.objects.select_for_update().get(pk=event.pk)
+                attendees_count = event.current_attendees_count
+                if attendees_count >= event.max_capacity:
+                    mark_sold_out(event.pk)
+                    return self.event_full_response()
+
+                # Attempt to create the attendee
+                # This leverages unique_together constraint in the Attendee model for duplicate email check
+                attendee = Attendee.objects.create(
+                    event=event,
+                    name=validated_data['name'],
+                    email=validated_data['email']
+                )
+        except IntegrityError:
+            return Response({"detail": "Attendee with this email is already registered for this event."},
+                            status=status.HTTP_409_CONFLICT) # Conflict status for duplicate
+
+        # That was the last seat
+        if attendees_count + 1 >= event.max_capacity:
+            mark_sold_out(event.pk)
+        return Response({"detail": "Attendee registered successfully.",
+                         "attendee_id": attendee.id}, status=status.HTTP_201_CREATED)
+
+    def event_full_response(self):
+        return Response({"detail": "Event is full. Cannot register more attendees."},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+
+def get_granularity(request):
+    granularity = request.query_params.get('granularity', 'hour')
+    if granularity not in GRANULARITIES:
+        raise ValidationError({"granularity": f"Must be one of: {', '.join(GRANULARITIES)}."})
+    return granularity
+
+
+class EventStatsAPIView(generics.GenericAPIView):
+    serializer_class = EventStatsDetailSerializer
+
+    def get(self, request, event_id):
+        granularity = get_granularity(request)
+        event = get_object_or_404(Event, pk=event_id)
+        serializer = self.get_serializer(get_event_stats(event, granularity))
+        return Response(serializer.data)
+
 
+class EventStatsListAPIView(generics.ListAPIView):
+    serializer_class = EventStatsSerializer
+    pagination_class = EventPagination
+
+    def get_queryset(self):
+        # Fill ratio per event, computed in the database
+        return Event.objects.annotate(
+            attendees_count=Count('attendees'),
+            fill_ratio=ExpressionWrapper(
+                Cast('attendees_count', FloatField()) / NullIf('max_capacity', 0),
+                output_field=FloatField()),
+        ).order_by('start_time')
+
+    def list(self, request, *args, **kwargs):
+        granularity = get_granularity(request)
+        response = super().list(request, *args, **kwargs)
+        total_capacity = Event.objects.aggregate(total=Sum('max_capacity'))['total'] or 0
+        response.data['summary'] = get_overall_stats(total_capacity, granularity)
+        return response
@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs inside a fresh interpreter so every settings profile pays its own
+# import cost. Prints one JSON line with the measurements.
+WORKER_SCRIPT = r"""
+import json, resource, sys, time
+
+started = time.perf_counter()
+import django
+django.setup()
+from django.conf import settings
+from django.urls import get_resolver
+get_resolver().url_patterns  # force ROOT_URLCONF (and every view) to import
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+import_time = time.perf_counter() - started
+
+from django.test import Client
+client = Client(HTTP_HOST='localhost')
+path = sys.argv[1]
+requests = int(sys.argv[2])
+
+started = time.perf_counter()
+status = client.get(path).status_code
+first_request = time.perf_counter() - started
+
+started = time.perf_counter()
+for _ in range(requests):
+    client.get(path)
+per_request = (time.perf_counter() - started) / requests if requests else 0.0
+
+print(json.dumps({
+    'status': status,
+    'import_time': import_time,
+    'first_request': first_request,
+    'per_request': per_request,
+    # ru_maxrss is in kilobytes on Linux
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'apps': len(settings.INSTALLED_APPS),
+    'middleware': len(settings.MIDDLEWARE),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = ('Compares worker startup time, first-request latency, per-request '
+            'overhead and RSS across settings profiles')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-modules', nargs='+',
+            default=['event_management_system.settings', 'event_management_system.settings_api'],
+            help='Settings modules to compare (each runs in its own process).')
+        parser.add_argument('--path', default='/api/events/',
+                            help='URL requested after startup.')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Warm requests used to measure per-request overhead.')
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Fresh processes per profile; the best run is reported.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'settings':<40} {'apps':>4} {'mw':>3} {'process':>9} {'import':>9} "
+            f"{'first req':>9} {'per req':>9} {'RSS MB':>7}")
+
+        for module in options['settings_modules']:
+            results = [self._run_worker(module, options) for _ in range(options['runs'])]
+            best = min(results, key=lambda r: r['process_time'])
+            self.stdout.write(
+                f"{module:<40} {best['apps']:>4} {best['middleware']:>3} "
+                f"{best['process_time'] * 1000:>7.1f}ms {best['import_time'] * 1000:>7.1f}ms "
+                f"{best['first_request'] * 1000:>7.1f}ms {best['per_request'] * 1000:>7.2f}ms "
+                f"{best['max_rss_kb'] / 1024:>7.1f}")
+
+    def _run_worker(self, module, options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=module)
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT, options['path'], str(options['requests'])],
+            env=env, capture_output=True, text=True)
+        process_time = time.perf_counter() - started
+
+        if proc.returncode != 0:
+            raise CommandError(f"Benchmark worker for {module} failed:\n{proc.stderr}")
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if result['status'] != 200:
+            raise CommandError(f"{options['path']} returned {result['status']} under {module}; "
+                               "has the database been migrated?")
+        result['process_time'] = process_time
+        return result
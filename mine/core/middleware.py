@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+
+from core.routers import reset_read_from_replica, set_read_from_replica
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE_NAME = 'read_primary_until'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe-method requests read from the replica, except for a client that
+    sent a write within the last ``REPLICA_STICKY_SECONDS`` (read-your-writes).
+
+    Stickiness is a short-lived cookie holding the time until which the
+    client reads from the primary, so it needs no shared state between
+    workers and is tracked per client even behind a proxy.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'REPLICA_DATABASE_ALIAS', None):
+            return self.get_response(request)
+
+        is_safe = request.method in SAFE_METHODS
+        token = set_read_from_replica(is_safe and not self.is_sticky(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_read_from_replica(token)
+
+        if not is_safe:
+            sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+            response.set_cookie(STICKY_COOKIE_NAME, str(time.time() + sticky_seconds),
+                                max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def is_sticky(self, request):
+        try:
+            return float(request.COOKIES[STICKY_COOKIE_NAME]) > time.time()
+        except (KeyError, ValueError):
+            return False
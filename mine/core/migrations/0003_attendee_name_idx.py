@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-19 09:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['name'], name='attendee_name_idx'),
+        ),
+    ]
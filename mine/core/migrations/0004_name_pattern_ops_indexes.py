@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_attendee_name_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendee',
+            name='attendee_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_name_idx',
+        ),
+        migrations.AddIndex(
+            model_name='attendee',
+            index=models.Index(fields=['name'], name='attendee_name_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['name'], name='event_name_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -14,6 +14,14 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_time'], name='event_start_time_idx'),
+            # varchar_pattern_ops lets Postgres use the index for LIKE 'prefix%' (admin search);
+            # other backends ignore opclasses and build a plain index
+            models.Index(fields=['name'], name='event_name_idx', opclasses=['varchar_pattern_ops']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -44,6 +52,12 @@ class Attendee(models.Model):
 
     class Meta:
         unique_together = ('event', 'email') # Prevents duplicate registration for the same email on the same event
+        indexes = [
+            # Back the admin's search_fields / list_filter / ordering on large tables
+            models.Index(fields=['email'], name='attendee_email_idx'),
+            models.Index(fields=['name'], name='attendee_name_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['registered_at'], name='attendee_registered_at_idx'),
+        ]
 
 
     def __str__(self):
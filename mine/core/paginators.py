@@ -0,0 +1,50 @@
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids a full ``COUNT(*)`` on large, unfiltered tables.
+
+    When the queryset has no WHERE clause, the row count is read from the
+    database's table statistics instead. Below ``exact_count_threshold`` rows,
+    or when no estimate is available, it falls back to an exact count.
+    """
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = self._estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.exact_count_threshold:
+                return estimate
+        return super().count
+
+    def _estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        table = queryset.model._meta.db_table
+        if connection.vendor == 'postgresql':
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE relname = %s"
+        elif connection.vendor == 'mysql':
+            sql = ("SELECT table_rows FROM information_schema.tables "
+                   "WHERE table_schema = DATABASE() AND table_name = %s")
+        elif connection.vendor == 'sqlite':
+            # Populated by ANALYZE; the first number in `stat` is the row count
+            sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+        else:
+            return None
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [table])
+                row = cursor.fetchone()
+        except DatabaseError:
+            return None
+        if not row or row[0] is None:
+            return None
+        try:
+            return int(str(row[0]).split()[0])
+        except ValueError:
+            return None
@@ -0,0 +1,41 @@
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` (core/middleware.py) marks safe-method requests
+as replica-readable; ``ReplicaRouter`` then sends their reads to the alias
+named by ``REPLICA_DATABASE_ALIAS``. Everything else, including management
+commands and writes, stays on ``default``.
+"""
+
+from contextvars import ContextVar
+
+from django.conf import settings
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def set_read_from_replica(value):
+    """Return a token for ``reset_read_from_replica``."""
+    return _read_from_replica.set(value)
+
+
+def reset_read_from_replica(token):
+    _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', None)
+        if alias and _read_from_replica.get():
+            return alias
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
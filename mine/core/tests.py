@@ -1,3 +1,242 @@
-from django.test import TestCase
+from unittest import mock, skipUnless
+import datetime
+import time
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection, connections, router
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Event, Attendee
+from core.middleware import STICKY_COOKIE_NAME, ReplicaRoutingMiddleware
+from core.paginators import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name="Meetup",
+            location="Hall 1",
+            start_time=now + datetime.timedelta(days=1),
+            end_time=now + datetime.timedelta(days=1, hours=2),
+            max_capacity=10
+        )
+        for i in range(3):
+            Attendee.objects.create(event=self.event, name=f"A{i}", email=f"a{i}@example.com")
+
+    def test_small_table_uses_exact_count(self):
+        paginator = EstimatedCountPaginator(Attendee.objects.order_by('pk'), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_large_unfiltered_table_uses_estimate(self):
+        paginator = EstimatedCountPaginator(Attendee.objects.order_by('pk'), 2)
+        with mock.patch.object(EstimatedCountPaginator, '_estimate_count', return_value=2000000):
+            self.assertEqual(paginator.count, 2000000)
+
+    def test_filtered_queryset_uses_exact_count(self):
+        queryset = Attendee.objects.filter(name="A1").order_by('pk')
+        paginator = EstimatedCountPaginator(queryset, 2)
+        with mock.patch.object(EstimatedCountPaginator, '_estimate_count', return_value=2000000) as estimate:
+            self.assertEqual(paginator.count, 1)
+        estimate.assert_not_called()
+
+    def test_missing_statistics_fall_back_to_exact_count(self):
+        # sqlite_stat1 only exists after ANALYZE
+        paginator = EstimatedCountPaginator(Attendee.objects.order_by('pk'), 2)
+        paginator.exact_count_threshold = 0
+        self.assertEqual(paginator.count, 3)
+
+
+@skipUnless(apps.is_installed('django.contrib.admin'), "admin not installed in this profile")
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+        now = timezone.now()
+        self.events = [
+            Event.objects.create(
+                name=f"Event {i}",
+                location="Hall",
+                start_time=now + datetime.timedelta(days=i + 1),
+                end_time=now + datetime.timedelta(days=i + 1, hours=2),
+                max_capacity=100
+            )
+            for i in range(3)
+        ]
+
+    def _add_attendees(self, per_event):
+        for event in self.events:
+            start = event.attendees.count()
+            for i in range(start, start + per_event):
+                Attendee.objects.create(event=event, name=f"A{i}", email=f"a{i}@example.com")
+
+    def _changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_attendee_changelist_query_count_is_constant(self):
+        url = reverse('admin:core_attendee_changelist')
+        self._add_attendees(1)
+        baseline = self._changelist_queries(url)
+        self._add_attendees(5)
+        self.assertEqual(self._changelist_queries(url), baseline)
+
+    def test_event_changelist_shows_annotated_counts(self):
+        self._add_attendees(2)
+        url = reverse('admin:core_event_changelist')
+        resp = self.client.get(url)
+        self.assertContains(resp, f'?event__id__exact={self.events[0].pk}">2</a>')
+
+        baseline = self._changelist_queries(url)
+        self._add_attendees(3)
+        self.assertEqual(self._changelist_queries(url), baseline)
+
+    def _search(self, model, term):
+        resp = self.client.get(reverse(f'admin:core_{model}_changelist'), {'q': term})
+        self.assertEqual(resp.status_code, 200)
+        return resp.context['cl'].queryset
+
+    def test_attendee_search_matches_exact_email_and_name_prefix(self):
+        self._add_attendees(2)
+        # one a1@example.com per event
+        self.assertEqual(self._search('attendee', 'a1@example.com').count(), 3)
+        self.assertEqual(self._search('attendee', 'A1@example.com').count(), 0)
+        self.assertEqual(self._search('attendee', 'A').count(), 6)
+        self.assertEqual(self._search('attendee', 'A1').count(), 3)
+        self.assertEqual(self._search('attendee', 'example.com').count(), 0)
+
+    def test_event_search_matches_name_prefix(self):
+        self.assertEqual(self._search('event', 'Event').count(), 3)
+        self.assertEqual(self._search('event', 'Hall').count(), 0)
+
+    @skipUnless(connection.vendor == 'sqlite', "query plan text is SQLite-specific")
+    def test_search_uses_indexes(self):
+        attendee_plan = self._search('attendee', 'A1').explain()
+        self.assertIn('attendee_email_idx', attendee_plan)
+        self.assertIn('attendee_name_idx', attendee_plan)
+        self.assertIn('event_name_idx', self._search('event', 'Event').explain())
+
+    def test_prefix_search_uses_startswith_off_sqlite(self):
+        # The U+10FFFF range is only sound under SQLite's BINARY collation
+        self._add_attendees(2)
+        model_admin = admin.site._registry[Attendee]
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'):
+            queryset, _ = model_admin.get_search_results(None, Attendee.objects.all(), 'A1')
+        _, params = queryset.query.sql_with_params()
+        self.assertIn('A1%', params)
+        self.assertNotIn('A1\U0010ffff', params)
+        self.assertEqual(queryset.count(), 3)
+
+    def test_attendee_changelist_filters_by_event(self):
+        self._add_attendees(2)
+        url = reverse('admin:core_attendee_changelist') + f'?event__id__exact={self.events[0].pk}'
+        resp = self.client.get(url)
+        self.assertEqual(resp.context['cl'].result_count, 2)
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica', REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.read_aliases = []
+
+        def view(request):
+            self.read_aliases.append(router.db_for_read(Event))
+            return HttpResponse()
+
+        self.middleware = ReplicaRoutingMiddleware(view)
+
+    def _request(self, method, cookies=None):
+        request = getattr(self.factory, method)('/api/events/')
+        request.COOKIES.update(cookies or {})
+        response = self.middleware(request)
+        return self.read_aliases[-1], response
+
+    def test_safe_methods_read_from_replica(self):
+        self.assertEqual(self._request('get')[0], 'replica')
+        self.assertEqual(self._request('head')[0], 'replica')
+
+    def test_writes_use_primary_and_set_sticky_cookie(self):
+        alias, response = self._request('post')
+        self.assertEqual(alias, 'default')
+        self.assertEqual(router.db_for_write(Event), 'default')
+        self.assertEqual(response.cookies[STICKY_COOKIE_NAME]['max-age'], 5)
+
+    def test_sticky_cookie_expires(self):
+        _, response = self._request('post')
+        cookies = {STICKY_COOKIE_NAME: response.cookies[STICKY_COOKIE_NAME].value}
+        self.assertEqual(self._request('get', cookies)[0], 'default')
+        with mock.patch('core.middleware.time.time', return_value=time.time() + 6):
+            self.assertEqual(self._request('get', cookies)[0], 'replica')
+
+    def test_malformed_cookie_is_ignored(self):
+        self.assertEqual(self._request('get', {STICKY_COOKIE_NAME: 'junk'})[0], 'replica')
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    @override_settings(REPLICA_DATABASE_ALIAS=None)
+    def test_no_replica_configured(self):
+        alias, response = self._request('post')
+        self.assertEqual(alias, 'default')
+        self.assertNotIn(STICKY_COOKIE_NAME, response.cookies)
+        self.assertEqual(self._request('get')[0], 'default')
+
+
+@override_settings(REPLICA_DATABASE_ALIAS='replica', REPLICA_STICKY_SECONDS=5)
+class ReplicaDatabaseTest(TestCase):
+    """Primary and replica are two separate SQLite test databases."""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        caches['admission'].clear()
+        now = timezone.now()
+        fields = dict(location="Hall", start_time=now + datetime.timedelta(days=1),
+                      end_time=now + datetime.timedelta(days=1, hours=2), max_capacity=10)
+        self.event = Event.objects.create(name="On primary", **fields)
+        # Same row on the replica, but with a different name so reads show which database answered
+        Event.objects.using('replica').create(pk=self.event.pk, name="On replica", **fields)
+
+    def _get(self, client, url):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            resp = client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return resp, len(primary), len(replica)
+
+    def test_get_requests_read_from_replica(self):
+        resp, primary, replica = self._get(self.client, reverse('event-list-create'))
+        self.assertEqual([e['name'] for e in resp.json()['results']], ["On replica"])
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_register_writes_to_primary_then_reads_stick_to_it(self):
+        register_url = reverse('event-register-attendee', kwargs={'event_id': self.event.pk})
+        attendees_url = reverse('event-attendee-list', kwargs={'event_id': self.event.pk})
+
+        with CaptureQueriesContext(connections['replica']) as replica:
+            resp = self.client.post(register_url, {"name": "Bob", "email": "bob@example.com"},
+                                    content_type='application/json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(replica), 0)
+        self.assertTrue(Attendee.objects.using('default').filter(email="bob@example.com").exists())
+        self.assertFalse(Attendee.objects.using('replica').exists())
+
+        # Same client: reads its own write from the primary
+        resp, primary, replica = self._get(self.client, attendees_url)
+        self.assertEqual([a['email'] for a in resp.json()['results']], ["bob@example.com"])
+        self.assertEqual(replica, 0)
+
+        # Another client is not pinned and still reads the (lagging) replica
+        resp, primary, replica = self._get(Client(), attendees_url)
+        self.assertEqual(resp.json()['results'], [])
+        self.assertEqual(primary, 0)
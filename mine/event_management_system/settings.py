@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -51,6 +52,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'event_management_system.urls'
@@ -84,6 +86,53 @@ DATABASES = {
     }
 }
 
+# Read replica for GET/HEAD/OPTIONS requests (core/routers.py). Reads go to
+# it only when REPLICA_DATABASE_ALIAS is set. Locally, a copy of db.sqlite3
+# can stand in for it:
+#   cp db.sqlite3 db_replica.sqlite3
+#   REPLICA_DATABASE_NAME=db_replica.sqlite3 python manage.py runserver
+# The alias is always defined so the tests can run against two databases.
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': BASE_DIR / os.environ.get('REPLICA_DATABASE_NAME', 'db_replica.sqlite3'),
+}
+
+REPLICA_DATABASE_ALIAS = 'replica' if os.environ.get('REPLICA_DATABASE_NAME') else None
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# After a write, the same client reads from the primary for this long
+# (tracked with a cookie, see core/middleware.py)
+REPLICA_STICKY_SECONDS = 5
+
+
+# Caches
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Registration token buckets and sold-out flags (api/admission.py).
+    # In-process by default; to share them between workers use e.g.
+    #   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    #   'LOCATION': '/var/tmp/event_admission',
+    'admission': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'admission',
+    },
+}
+
+ADMISSION_CACHE_ALIAS = 'admission'
+
+# Seconds a sold-out flag or seat counter is trusted before being rebuilt
+# from the database. Bounds how long other workers can serve stale state.
+ADMISSION_STATE_TIMEOUT = 5
+
+# Seconds cached registration stats (api/stats.py) are reused before a full
+# recompute. Bounds staleness in workers that did not see a delete or edit.
+EVENT_STATS_CACHE_TIMEOUT = 30
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -108,6 +157,12 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 1,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Client address for throttling: 0 uses REMOTE_ADDR and ignores a client-supplied
+    # X-Forwarded-For. Set to the number of trusted proxies in front of the app.
+    'NUM_PROXIES': 0,
+    'DEFAULT_THROTTLE_RATES': {
+        'registration': '10/min',  # token bucket per client per event, see api/admission.py
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -117,6 +172,10 @@ SPECTACULAR_SETTINGS = {
   # other spectacular settings…
 }
 
+# Serve the schema / Swagger / ReDoc views from api/urls.py.
+# The API-only profile (settings_api.py) turns this off by default.
+API_SCHEMA_ENABLED = True
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
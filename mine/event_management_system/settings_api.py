@@ -0,0 +1,63 @@
+"""
+Lean settings profile for API-only worker processes.
+
+The API endpoints use none of sessions, CSRF, messages or the admin, so this
+profile drops those apps and middleware from the base settings to cut import
+time and per-request overhead. Start workers with:
+
+    DJANGO_SETTINGS_MODULE=event_management_system.settings_api
+
+Set API_SCHEMA_ENABLED=1 in the environment to also serve the schema,
+Swagger UI and ReDoc views (this loads drf_spectacular).
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+
+
+API_SCHEMA_ENABLED = os.environ.get('API_SCHEMA_ENABLED', '') == '1'
+
+INSTALLED_APPS = [
+    'core',
+    'api',
+    'rest_framework',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+# No django.contrib.auth: skip the session/basic authenticators and the
+# AnonymousUser model, and only render JSON (no browsable API templates).
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
+
+AUTH_PASSWORD_VALIDATORS = []
+
+if API_SCHEMA_ENABLED:
+    INSTALLED_APPS += ['drf_spectacular']
+else:
+    # Fall back to DRF's own schema class so drf_spectacular is never imported
+    del REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS']